@@ -19,6 +19,15 @@
 #
 import asyncio
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from lsst.ts import ATDome
 
+if uvloop is not None:
+    # Use the faster uvloop event loop, if available.
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 asyncio.run(ATDome.ATDomeCsc.amain(index=None))
@@ -24,6 +24,8 @@ import asyncio
 import enum
 import math
 import pathlib
+import socket
+import time
 
 from lsst.ts import salobj
 from lsst.ts.idl.enums.ATDome import (
@@ -37,6 +39,27 @@ from .status import Status
 
 _LOCAL_HOST = "127.0.0.1"
 
+# Command terminator.
+_CRLF = b"\r\n"
+
+# Prompt that ends each reply from the TCP/IP controller.
+_PROMPT = b">"
+
+# asyncio.timeout is lighter weight than asyncio.wait_for,
+# because it does not wrap the awaitable in a new task,
+# but it requires Python 3.11 or later.
+_timeout = getattr(asyncio, "timeout", None)
+
+
+# Dict of command: number of reply lines, excluding the final ">".
+# Commands not listed here have no reply lines.
+_EXPECTED_LINES = {"+": 25}
+
+# Stream reader buffer limit (bytes). The longest reply, full status,
+# is about 1 kB, so this is ample, yet small enough that a runaway
+# reply without a prompt fails quickly with a LimitOverrunError.
+_READ_LIMIT = 4096
+
 
 class MoveCode(enum.IntFlag):
     AZPOSITIVE = 1
@@ -55,6 +78,95 @@ class Axis(enum.Flag):
     MAINDOOR = enum.auto()
 
 
+# Move code bits as plain ints, for computing status several times a second
+# (bitwise operations on MoveCode members construct new MoveCode instances).
+_AZ_POSITIVE = int(MoveCode.AZPOSITIVE)
+_AZ_NEGATIVE = int(MoveCode.AZNEGATIVE)
+_MAIN_DOOR_CLOSING = int(MoveCode.MAINDOORCLOSING)
+_MAIN_DOOR_OPENING = int(MoveCode.MAINDOOROPENING)
+_DROPOUT_DOOR_CLOSING = int(MoveCode.DROPOUTDOORCLOSING)
+_DROPOUT_DOOR_OPENING = int(MoveCode.DROPOUTDOOROPENING)
+_HOMING = int(MoveCode.HOMING)
+
+# Move code bit masks for "axis is moving in either direction".
+_AZ_MOVING = _AZ_POSITIVE | _AZ_NEGATIVE
+_DROPOUT_DOOR_MOVING = _DROPOUT_DOOR_CLOSING | _DROPOUT_DOOR_OPENING
+_MAIN_DOOR_MOVING = _MAIN_DOOR_CLOSING | _MAIN_DOOR_OPENING
+
+# Axis bit masks as plain ints, for checking the in-position mask.
+_AZ_AXIS = Axis.AZ.value
+_SHUTTER_AXES = (Axis.DROPOUTDOOR | Axis.MAINDOOR).value
+
+# Shutter door data for `ATDomeCsc.compute_in_position_mask`, as a tuple of:
+# (move code moving mask, commanded state event attribute name,
+# tel_position opening percentage field name, axis).
+_DOOR_SPECS = (
+    (
+        _DROPOUT_DOOR_MOVING,
+        "evt_dropoutDoorCommandedState",
+        "dropoutDoorOpeningPercentage",
+        Axis.DROPOUTDOOR,
+    ),
+    (
+        _MAIN_DOOR_MOVING,
+        "evt_mainDoorCommandedState",
+        "mainDoorOpeningPercentage",
+        Axis.MAINDOOR,
+    ),
+)
+
+# Dict of shutter door commanded state: opening percentage (%)
+# at which a halted door is in position.
+_DOOR_CMD_STATE_PCT = {
+    ShutterDoorCommandedState.OPENED: 100,
+    ShutterDoorCommandedState.CLOSED: 0,
+}
+
+
+async def _wait_for(awaitable, timeout):
+    """Await ``awaitable`` with a time limit, like `asyncio.wait_for`.
+
+    Use `asyncio.timeout`, if available, to avoid making a new task.
+
+    Raises
+    ------
+    asyncio.TimeoutError
+        If the time limit is exceeded.
+    """
+    if _timeout is None:
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+    async with _timeout(timeout):
+        return await awaitable
+
+
+class _DisconnectedError(ConnectionError):
+    """The CSC disconnected from the TCP/IP controller before
+    a command got its reply.
+    """
+
+    def __init__(self):
+        super().__init__("Disconnected from the TCP/IP controller")
+
+
+def angle_diff_deg(angle1, angle2):
+    """Return angle1 - angle2 wrapped into the range [-180, 180) deg.
+
+    A float version of `lsst.ts.salobj.angle_diff`, which returns
+    an `astropy.coordinates.Angle`.
+
+    Parameters
+    ----------
+    angle1, angle2 : `float`
+        Angles (deg).
+
+    Returns
+    -------
+    diff : `float`
+        angle1 - angle2, wrapped into the range [-180, 180) (deg).
+    """
+    return (angle1 - angle2 + 180) % 360 - 180
+
+
 class ATDomeCsc(salobj.ConfigurableCsc):
     """AuxTel dome CSC
 
@@ -120,12 +232,13 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         # Set the initial value here, then update from the
         # "Tolerance" reported in long status.
         self.az_tolerance = 1.5
-        # Task for sleeping in the status loop; cancel this to trigger
-        # an immediate status update. Warning: do not cancel status_task
+        # Event the status loop waits on between status updates;
+        # set this to trigger an immediate status update.
+        # Warning: do not cancel status_task to trigger a status update,
         # because that may be waiting for TCP/IP communication.
-        self.status_sleep_task = salobj.make_done_future()
-        # Task for the status loop. To trigger new status cancel
-        # status_sleep_task, not status_task.
+        self.trigger_status_event = asyncio.Event()
+        # Task for the status loop. To trigger new status set
+        # trigger_status_event; do not cancel status_task.
         self.status_task = salobj.make_done_future()
         # Task that waits while connecting to the TCP/IP controller.
         self.connect_task = salobj.make_done_future()
@@ -136,7 +249,12 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         # ShutterDoorState.CLOSED or None (for don't care)
         self.desired_main_shutter_state = None
         self.desired_dropout_shutter_state = None
-        self.cmd_lock = asyncio.Lock()
+        # Queue of (command, future) to send to the TCP/IP controller.
+        # Only `command_task` reads the queue, so commands and their replies
+        # are handled one at a time, in order; see `run_command`.
+        self.command_queue = asyncio.Queue()
+        # Task that sends queued commands and reads the replies.
+        self.command_task = salobj.make_done_future()
         self.config = None
         self.mock_port = mock_port
         super().__init__(
@@ -147,6 +265,23 @@ class ATDomeCsc(salobj.ConfigurableCsc):
             initial_state=initial_state,
             simulation_mode=simulation_mode,
         )
+        # Bound methods for topics that `handle_status` writes
+        # on every status update.
+        self._tel_position_set = self.tel_position.set
+        self._tel_position_set_put = self.tel_position.set_put
+        self._azimuth_state_set_put = self.evt_azimuthState.set_put
+        self._dropout_door_state_set_put = self.evt_dropoutDoorState.set_put
+        self._main_door_state_set_put = self.evt_mainDoorState.set_put
+        self._azimuth_in_position_set_put = self.evt_azimuthInPosition.set_put
+        self._shutter_in_position_set_put = self.evt_shutterInPosition.set_put
+        self._all_axes_in_position_set_put = self.evt_allAxesInPosition.set_put
+        self._emergency_stop_set_put = self.evt_emergencyStop.set_put
+        self._scb_link_set_put = self.evt_scbLink.set_put
+        self._door_encoder_extremes_set_put = self.evt_doorEncoderExtremes.set_put
+        self._last_azimuth_goto_set_put = self.evt_lastAzimuthGoTo.set_put
+        self._settings_applied_dome_controller_set_put = (
+            self.evt_settingsAppliedDomeController.set_put
+        )
 
     async def do_moveAzimuth(self, data):
         """Implement the ``moveAzimuth`` command."""
@@ -164,7 +299,7 @@ class ATDomeCsc(salobj.ConfigurableCsc):
             azimuth=azimuth,
             force_output=True,
         )
-        self.status_sleep_task.cancel()
+        self.trigger_status_event.set()
 
     async def do_closeShutter(self, data):
         """Implement the ``closeShutter`` command."""
@@ -209,7 +344,7 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         )
         await self.run_command("ST")
         self.shutter_task.cancel()
-        self.status_sleep_task.cancel()
+        self.trigger_status_event.set()
 
     async def do_homeAzimuth(self, data):
         """Implement the ``homeAzimuth`` command."""
@@ -222,7 +357,7 @@ class ATDomeCsc(salobj.ConfigurableCsc):
             force_output=True,
         )
         await self.run_command("HM")
-        self.status_sleep_task.cancel()
+        self.trigger_status_event.set()
 
     async def do_moveShutterDropoutDoor(self, data):
         """Implement the ``moveShutterDropoutDoor`` command."""
@@ -292,47 +427,90 @@ class ATDomeCsc(salobj.ConfigurableCsc):
             If communication fails. Also an exception is logged,
             the CSC disconnects from the low level controller,
             and goes into FAULT state.
+            If the CSC disconnects before the command is run or its reply
+            is read.
             If the wrong number of lines is read. Also a warning is logged.
+        RuntimeError
+            If not connected and not connecting,
+            or if the connection attempt fails or is cancelled.
         """
         if not self.connected:
             if self.disabled_or_enabled and not self.connect_task.done():
-                await self.connect_task
+                # Use asyncio.wait so that `disconnect` cancelling
+                # connect_task does not cancel this command.
+                await asyncio.wait([self.connect_task])
+                if not self.connected:
+                    raise RuntimeError("Not connected; connection failed")
             else:
                 raise RuntimeError("Not connected and not trying to connect")
 
-        async with self.cmd_lock:
-            self.writer.write(f"{cmd}\r\n".encode())
-            await self.writer.drain()
-            if cmd == "?":
-                # Turn short status into long status
-                cmd = "+"
-            expected_lines = {"+": 25}.get(cmd, 0)  # excluding final ">" line
+        future = asyncio.Future()
+        self.command_queue.put_nowait((cmd, future))
+        if cmd == "?":
+            # Turn short status into long status
+            cmd = "+"
+        expected_lines = _EXPECTED_LINES.get(cmd, 0)
+
+        try:
+            read_bytes = await future
+        except _DisconnectedError as e:
+            # The CSC is already disconnecting; don't disconnect or fault.
+            raise salobj.ExpectedError(f"Command {cmd!r} not run: {e}")
+        except Exception as e:
+            if isinstance(e, asyncio.streams.IncompleteReadError):
+                err_msg = "TCP/IP controller exited"
+            else:
+                err_msg = "TCP/IP read failed"
+            self.log.exception(err_msg)
+            await self.disconnect()
+            self.fault(code=2, report=f"{err_msg}: {e}")
+            raise salobj.ExpectedError(err_msg)
+
+        # [:-1] strips the final > line. The controller replies in ASCII.
+        lines = [elt.strip().decode("ascii") for elt in read_bytes.split(b"\n")[:-1]]
+        if len(lines) != expected_lines:
+            err_msg = (
+                f"Command {cmd} returned {read_bytes!r}; "
+                f"expected {expected_lines} lines"
+            )
+            self.log.error(err_msg)
+            raise salobj.ExpectedError(err_msg)
+        elif cmd == "+":
+            self.handle_status(lines)
+
+    async def command_loop(self):
+        """Send queued commands to the TCP/IP controller and read the replies.
+
+        Commands are sent one at a time, in the order `run_command`
+        queued them. The result of each command's future is the reply
+        as bytes, including the final ">".
 
+        A reply is read even if the command's future is cancelled
+        while waiting for it, so the next command gets its own reply.
+        """
+        while True:
+            cmd, future = await self.command_queue.get()
+            if future.done():
+                # The caller stopped waiting before the command was sent.
+                continue
             try:
-                read_bytes = await asyncio.wait_for(
-                    self.reader.readuntil(b">"), timeout=self.config.read_timeout
+                self.writer.write(cmd.encode() + _CRLF)
+                await self.writer.drain()
+                read_bytes = await _wait_for(
+                    self.reader.readuntil(_PROMPT), timeout=self.config.read_timeout
                 )
+            except asyncio.CancelledError:
+                # Cancelled by `disconnect`. Fail the command instead of
+                # cancelling its future, because the caller was not cancelled.
+                if not future.done():
+                    future.set_exception(_DisconnectedError())
+                raise
             except Exception as e:
-                if isinstance(e, asyncio.streams.IncompleteReadError):
-                    err_msg = "TCP/IP controller exited"
-                else:
-                    err_msg = "TCP/IP read failed"
-                self.log.exception(err_msg)
-                await self.disconnect()
-                self.fault(code=2, report=f"{err_msg}: {e}")
-                raise salobj.ExpectedError(err_msg)
-
-            data = read_bytes.decode()
-            lines = data.split("\n")[:-1]  # strip final > line
-            lines = [elt.strip() for elt in lines]
-            if len(lines) != expected_lines:
-                err_msg = (
-                    f"Command {cmd} returned {data!r}; expected {expected_lines} lines"
-                )
-                self.log.error(err_msg)
-                raise salobj.ExpectedError(err_msg)
-            elif cmd == "+":
-                self.handle_status(lines)
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(read_bytes)
 
     def compute_in_position_mask(self, move_code):
         """Compute in_position_mask.
@@ -349,70 +527,23 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         in_position_mask : `MoveCode`
             A bit mask with 1 for each axis that is in position.
         """
+        position = self.tel_position.data
+        az_cmd = self.evt_azimuthCommandedState.data
+
         mask = Axis(0)
-        az_halted = move_code & (MoveCode.AZPOSITIVE | MoveCode.AZNEGATIVE) == 0
-        if (
-            az_halted
-            and self.evt_azimuthCommandedState.data.commandedState
-            == AzimuthCommandedState.GOTOPOSITION
-        ):
-            daz = salobj.angle_diff(
-                self.tel_position.data.azimuthPosition,
-                self.evt_azimuthCommandedState.data.azimuth,
-            )
+        az_halted = move_code & _AZ_MOVING == 0
+        if az_halted and az_cmd.commandedState == AzimuthCommandedState.GOTOPOSITION:
+            daz = angle_diff_deg(position.azimuthPosition, az_cmd.azimuth)
             if abs(daz) < self.az_tolerance:
                 mask |= Axis.AZ
 
-        dropout_halted = (
-            move_code & (MoveCode.DROPOUTDOORCLOSING | MoveCode.DROPOUTDOOROPENING) == 0
-        )
-        if dropout_halted:
-            if (
-                self.evt_dropoutDoorCommandedState.data.commandedState
-                == ShutterDoorCommandedState.OPENED
-            ):
-                if self.tel_position.data.dropoutDoorOpeningPercentage == 100:
-                    mask |= Axis.DROPOUTDOOR
-            elif (
-                self.evt_dropoutDoorCommandedState.data.commandedState
-                == ShutterDoorCommandedState.CLOSED
-            ):
-                if self.tel_position.data.dropoutDoorOpeningPercentage == 0:
-                    mask |= Axis.DROPOUTDOOR
-
-        dropout_halted = (
-            move_code & (MoveCode.DROPOUTDOORCLOSING | MoveCode.DROPOUTDOOROPENING) == 0
-        )
-        if dropout_halted:
-            if (
-                self.evt_dropoutDoorCommandedState.data.commandedState
-                == ShutterDoorCommandedState.OPENED
-            ):
-                if self.tel_position.data.dropoutDoorOpeningPercentage == 100:
-                    mask |= Axis.DROPOUTDOOR
-            elif (
-                self.evt_dropoutDoorCommandedState.data.commandedState
-                == ShutterDoorCommandedState.CLOSED
-            ):
-                if self.tel_position.data.dropoutDoorOpeningPercentage == 0:
-                    mask |= Axis.DROPOUTDOOR
-
-        main_halted = (
-            move_code & (MoveCode.MAINDOORCLOSING | MoveCode.MAINDOOROPENING) == 0
-        )
-        if main_halted:
-            if (
-                self.evt_mainDoorCommandedState.data.commandedState
-                == ShutterDoorCommandedState.OPENED
-            ):
-                if self.tel_position.data.mainDoorOpeningPercentage == 100:
-                    mask |= Axis.MAINDOOR
-            elif (
-                self.evt_mainDoorCommandedState.data.commandedState
-                == ShutterDoorCommandedState.CLOSED
-            ):
-                if self.tel_position.data.mainDoorOpeningPercentage == 0:
-                    mask |= Axis.MAINDOOR
+        for moving_mask, cmd_state_attr, pct_field, axis in _DOOR_SPECS:
+            if move_code & moving_mask != 0:
+                continue
+            cmd_state = getattr(self, cmd_state_attr).data.commandedState
+            desired_pct = _DOOR_CMD_STATE_PCT.get(cmd_state)
+            if desired_pct is not None and getattr(position, pct_field) == desired_pct:
+                mask |= axis
 
         return mask
 
@@ -429,9 +560,9 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         state : `int`
             The appropriate `AzimuthState` enum value.
         """
-        if move_code & MoveCode.AZPOSITIVE:
+        if move_code & _AZ_POSITIVE:
             state = AzimuthState.MOVINGCW
-        elif move_code & MoveCode.AZNEGATIVE:
+        elif move_code & _AZ_NEGATIVE:
             state = AzimuthState.MOVINGCCW
         else:
             state = AzimuthState.NOTINMOTION
@@ -449,13 +580,14 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         move_code : `int`
             Motion code: the integer from line 5 of short status.
         """
-        closing_code = (
-            MoveCode.MAINDOORCLOSING if is_main else MoveCode.DROPOUTDOORCLOSING
-        )
-        opening_code = (
-            MoveCode.MAINDOOROPENING if is_main else MoveCode.DROPOUTDOOROPENING
-        )
-        door_mask = closing_code | opening_code
+        if is_main:
+            closing_code = _MAIN_DOOR_CLOSING
+            opening_code = _MAIN_DOOR_OPENING
+            door_mask = _MAIN_DOOR_MOVING
+        else:
+            closing_code = _DROPOUT_DOOR_CLOSING
+            opening_code = _DROPOUT_DOOR_OPENING
+            door_mask = _DROPOUT_DOOR_MOVING
         door_state = None
         if move_code & door_mask == 0:
             if open_pct == 0:
@@ -505,24 +637,34 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         else:
             host = self.config.host
         try:
-            async with self.cmd_lock:
-                if self.simulation_mode != 0:
-                    if self.mock_ctrl is None:
-                        raise RuntimeError(
-                            "In simulation mode but no mock controller found."
-                        )
-                    port = self.mock_ctrl.port
-                else:
-                    port = self.config.port
-                connect_coro = asyncio.open_connection(host=host, port=port)
-                self.reader, self.writer = await asyncio.wait_for(
-                    connect_coro, timeout=self.config.connection_timeout
-                )
-                # drop welcome message
-                await asyncio.wait_for(
-                    self.reader.readuntil(">".encode()),
-                    timeout=self.config.read_timeout,
-                )
+            if self.simulation_mode != 0:
+                if self.mock_ctrl is None:
+                    raise RuntimeError(
+                        "In simulation mode but no mock controller found."
+                    )
+                port = self.mock_ctrl.port
+            else:
+                port = self.config.port
+            connect_coro = asyncio.open_connection(
+                host=host, port=port, limit=_READ_LIMIT
+            )
+            reader, writer = await asyncio.wait_for(
+                connect_coro, timeout=self.config.connection_timeout
+            )
+            sock = writer.get_extra_info("socket")
+            if sock is not None:
+                # Commands and replies are short and latency matters,
+                # so disable Nagle's algorithm (asyncio usually does this
+                # already). Use keepalive to notice a dead controller
+                # connection, which is kept open for as long as the CSC runs.
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # drop welcome message
+            await _wait_for(reader.readuntil(_PROMPT), timeout=self.config.read_timeout)
+            # Only set reader and writer once the welcome message is read,
+            # so `run_command` cannot use the connection before it is ready.
+            self.reader = reader
+            self.writer = writer
             self.log.debug("connected")
         except Exception as e:
             err_msg = (
@@ -532,7 +674,8 @@ class ATDomeCsc(salobj.ConfigurableCsc):
             self.fault(code=1, report=f"{err_msg}: {e}")
             return
 
-        self.status_task = asyncio.ensure_future(self.status_loop())
+        self.command_task = asyncio.create_task(self.command_loop())
+        self.status_task = asyncio.create_task(self.status_loop())
 
     @property
     def connected(self):
@@ -579,7 +722,7 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         except salobj.ExpectedError:
             # We tried. A message has been logged.
             pass
-        self.status_sleep_task.cancel()
+        self.trigger_status_event.set()
 
     async def disconnect(self):
         """Disconnect from the TCP/IP controller, if connected, and stop
@@ -587,6 +730,11 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         """
         self.log.debug("disconnect")
         self.connect_task.cancel()
+        self.command_task.cancel()
+        while not self.command_queue.empty():
+            cmd, future = self.command_queue.get_nowait()
+            if not future.done():
+                future.set_exception(_DisconnectedError())
         writer = self.writer
         self.reader = None
         self.writer = None
@@ -596,7 +744,7 @@ class ATDomeCsc(salobj.ConfigurableCsc):
                 await asyncio.wait_for(writer.drain(), timeout=2)
             finally:
                 writer.close()
-        self.status_sleep_task.cancel()
+        self.trigger_status_event.set()
         if not self.status_task.done():
             await asyncio.wait_for(
                 self.status_task, timeout=self.config.read_timeout * 2
@@ -604,67 +752,53 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         await self.stop_mock_ctrl()
 
     def handle_status(self, lines):
-        """Handle output of "?" command.
+        """Handle output of "+", the full status command.
+
+        Parse the status once and output all events and telemetry from it.
 
         Parameters
         ----------
         lines : `iterable` of `str`
-            Lines of output from "?", the short status command, or the
-            first 5 lines of output from the full status command "+".
-
-        Returns
-        -------
-        settingsAppliedDomeController : `bool`
-            True if ``self.evt_settingsAppliedDomeController`` updated.
+            Lines of output from "+", the full status command.
         """
         status = Status(lines)
 
         # TODO: DM-23808 the azimuthEncoderPosition isn't big enough.
         # Once that is fixed, ditch the try/except and set the field normally.
         try:
-            self.tel_position.set(azimuthEncoderPosition=status.encoder_counts)
+            self._tel_position_set(azimuthEncoderPosition=status.encoder_counts)
         except ValueError:
             self.log.warning(
                 f"status.encoder_counts={status.encoder_counts} too big for SAL topic!"
             )
-            self.tel_position.set(azimuthEncoderPosition=0)
-        self.tel_position.set_put(
+            self._tel_position_set(azimuthEncoderPosition=0)
+        self._tel_position_set_put(
             mainDoorOpeningPercentage=status.main_door_pct,
             dropoutDoorOpeningPercentage=status.dropout_door_pct,
             azimuthPosition=status.az_pos,
         )
 
         move_code = status.move_code
-        self.evt_azimuthState.set_put(
-            state=self.compute_az_state(move_code),
-            homing=bool(move_code & MoveCode.HOMING),
+        self._azimuth_state_set_put(
+            state=self.compute_az_state(move_code), homing=bool(move_code & _HOMING),
         )
 
         dropout_door_state = self.compute_door_state(
-            open_pct=self.tel_position.data.dropoutDoorOpeningPercentage,
-            is_main=False,
-            move_code=move_code,
+            open_pct=status.dropout_door_pct, is_main=False, move_code=move_code,
         )
         main_door_state = self.compute_door_state(
-            open_pct=self.tel_position.data.mainDoorOpeningPercentage,
-            is_main=True,
-            move_code=move_code,
+            open_pct=status.main_door_pct, is_main=True, move_code=move_code,
         )
-        self.evt_dropoutDoorState.set_put(state=dropout_door_state)
-        self.evt_mainDoorState.set_put(state=main_door_state)
-
-        self.evt_emergencyStop.set_put(active=move_code & MoveCode.ESTOP > 0)
+        self._dropout_door_state_set_put(state=dropout_door_state)
+        self._main_door_state_set_put(state=main_door_state)
 
         in_position_mask = self.compute_in_position_mask(move_code)
-
-        def in_position(mask):
-            return in_position_mask & mask == mask
-
-        azimuth_in_position = in_position(Axis.AZ)
-        shutter_in_position = in_position(Axis.DROPOUTDOOR | Axis.MAINDOOR)
-        self.evt_azimuthInPosition.set_put(inPosition=azimuth_in_position)
-        self.evt_shutterInPosition.set_put(inPosition=shutter_in_position)
-        self.evt_allAxesInPosition.set_put(
+        in_position_bits = in_position_mask.value
+        azimuth_in_position = in_position_bits & _AZ_AXIS == _AZ_AXIS
+        shutter_in_position = in_position_bits & _SHUTTER_AXES == _SHUTTER_AXES
+        self._azimuth_in_position_set_put(inPosition=azimuth_in_position)
+        self._shutter_in_position_set_put(inPosition=shutter_in_position)
+        self._all_axes_in_position_set_put(
             inPosition=azimuth_in_position and shutter_in_position
         )
 
@@ -679,20 +813,20 @@ class ATDomeCsc(salobj.ConfigurableCsc):
             if end_shutter_task:
                 self.shutter_task.set_result(None)
 
-        self.evt_emergencyStop.set_put(active=status.estop_active)
+        self._emergency_stop_set_put(active=status.estop_active)
 
-        self.evt_scbLink.set_put(active=status.scb_link_ok)
+        self._scb_link_set_put(active=status.scb_link_ok)
 
-        self.evt_doorEncoderExtremes.set_put(
+        self._door_encoder_extremes_set_put(
             mainClosed=status.main_door_encoder_closed,
             mainOpened=status.main_door_encoder_opened,
             dropoutClosed=status.dropout_door_encoder_closed,
             dropoutOpened=status.dropout_door_encoder_opened,
         )
 
-        self.evt_lastAzimuthGoTo.set_put(position=status.last_azimuth_goto)
+        self._last_azimuth_goto_set_put(position=status.last_azimuth_goto)
 
-        self.evt_settingsAppliedDomeController.set_put(
+        self._settings_applied_dome_controller_set_put(
             rainSensorEnabled=status.rain_sensor_enabled,
             cloudSensorEnabled=status.cloud_sensor_enabled,
             tolerance=status.tolerance,
@@ -742,7 +876,7 @@ class ATDomeCsc(salobj.ConfigurableCsc):
         self.desired_dropout_shutter_state = dropout_state
         self.desired_main_shutter_state = main_state
         self.shutter_task = asyncio.Future()
-        self.status_sleep_task.cancel()
+        self.trigger_status_event.set()
         await self.shutter_task
 
     async def start_mock_ctrl(self):
@@ -767,7 +901,14 @@ class ATDomeCsc(salobj.ConfigurableCsc):
     async def handle_summary_state(self):
         if self.disabled_or_enabled:
             if not self.connected and self.connect_task.done():
-                await self.connect()
+                connect_task = asyncio.create_task(self.connect())
+                self.connect_task = connect_task
+                # `disconnect` cancels connect_task if the CSC leaves
+                # DISABLED or ENABLED state while connecting; that is not
+                # an error, but a failed connection is.
+                await asyncio.wait([connect_task])
+                if not connect_task.cancelled():
+                    connect_task.result()
         else:
             await self.disconnect()
 
@@ -787,19 +928,29 @@ class ATDomeCsc(salobj.ConfigurableCsc):
 
     async def status_loop(self):
         """Read and report status from the TCP/IP controller.
+
+        Request status every ``status_interval`` seconds, measured from
+        the start of one request to the start of the next, so the interval
+        does not include the time taken to get the status.
         """
-        self.status_sleep_task.cancel()
         while self.connected:
+            # Clear the event before requesting status. If it is set
+            # while status is being read, the next status is requested
+            # as soon as this one has been handled.
+            self.trigger_status_event.clear()
+            start_time = time.monotonic()
             try:
                 await self.run_command("+")
             except Exception:
                 self.log.exception("Status request failed; status loop continues")
+            if self.trigger_status_event.is_set():
+                continue
+            remaining_time = self.status_interval - (time.monotonic() - start_time)
             try:
-                self.status_sleep_task = asyncio.ensure_future(
-                    asyncio.sleep(self.status_interval)
+                await _wait_for(
+                    self.trigger_status_event.wait(), timeout=max(remaining_time, 0)
                 )
-                await self.status_sleep_task
-            except asyncio.CancelledError:
+            except asyncio.TimeoutError:
                 pass
 
     async def close_tasks(self):
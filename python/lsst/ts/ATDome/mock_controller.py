@@ -260,7 +260,7 @@ class MockDomeController:
         """Rotate azimuth to the home position.
         """
         self._homing_task.cancel()
-        self._homing_task = asyncio.ensure_future(self.implement_home())
+        self._homing_task = asyncio.create_task(self.implement_home())
 
     def do_set_cmd_az(self, data):
         """Set commanded azimuth position.
@@ -23,13 +23,47 @@ __all__ = ["Status"]
 import re
 
 
+# Regular expressions for the 25 lines of full status, in order.
+# Compile these once, since status is parsed several times per second.
+_LINE_REGEXES = tuple(
+    re.compile(regex)
+    for regex in (
+        r"MAIN +[A-Z]+ +(\d+)",
+        r"DROP +[A-Z]+ +(\d+)",
+        r"\[(ON|OFF)\] +(\d+)",
+        r"(?:POSN|HOME) +(\d*\.?\d+)",
+        r"(?:RL|RR|--) +(\d+)",
+        r"Emergency Stop Active: +(\d)",
+        r"Top Comm Link OK: +(\d)",
+        r"Home Azimuth: +(\d*\.?\d+)",
+        r"High Speed.+: +(\d*\.?\d+)",
+        r"Coast.+: +(\d*\.?\d+)",
+        r"Tolerance.+: +(\d*\.?\d+)",
+        r"Encoder Counts per 360: +(\d+)",
+        r"Encoder Counts: +(\d+)",
+        r"Last Azimuth GoTo: +(\d*\.?\d+)",
+        r"Azimuth Move Timeout.+: +(\d*\.?\d+)",
+        r"Rain-Snow enabled: +(\d)",
+        r"Cloud Sensor enabled: +(\d)",
+        r"Watchdog Reset Time: +(\d*\.?\d+)",
+        r"Dropout Timer: +(\d*\.?\d+)",
+        r"Reverse Delay: +(\d*\.?\d+)",
+        r"Main Door Encoder Closed: +(\d+)",
+        r"Main Door Encoder Opened: +(\d+)",
+        r"Dropout Encoder Closed: +(\d+)",
+        r"Dropout Encoder Opened: +(\d+)",
+        r"Door Move Timeout.+: +(\d*\.?\d+)",
+    )
+)
+
+
 def parse(regex, line):
     """Parse a line of status.
 
     Parameters
     ----------
-    regex : `str`
-        Regex to match
+    regex : `re.Pattern`
+        Compiled regex to match
     line : `str`
         Line to parse
 
@@ -43,100 +77,71 @@ def parse(regex, line):
     RuntimeError
         If the line does not match the regex.
     """
-    match = re.match(regex, line)
+    match = regex.match(line)
     if match is None:
-        raise RuntimeError(f"Cound not parse {line!r} as {regex}")
+        raise RuntimeError(f"Cound not parse {line!r} as {regex.pattern}")
     return match
 
 
-def parse_get(regex, line):
-    """Parse a line of status and return the value of group(1)."""
-    match = parse(regex, line)
-    return match.group(1)
-
-
 class Status:
     """Parsed data of the output from "+", the full status command.
     """
 
     def __init__(self, lines):
-        if len(lines) != 25:
-            raise RuntimeError(f"Got {len(lines)} lines; need 25")
+        if len(lines) != len(_LINE_REGEXES):
+            raise RuntimeError(f"Got {len(lines)} lines; need {len(_LINE_REGEXES)}")
+
+        values = [
+            parse(regex, line).groups() for regex, line in zip(_LINE_REGEXES, lines)
+        ]
 
-        self.main_door_pct = float(parse_get(r"MAIN +[A-Z]+ +(\d+)", lines[0]))
+        self.main_door_pct = float(values[0][0])
 
-        self.dropout_door_pct = float(parse_get(r"DROP +[A-Z]+ +(\d+)", lines[1]))
+        self.dropout_door_pct = float(values[1][0])
 
-        auto_shutdown_match = parse(r"\[(ON|OFF)\] +(\d+)", lines[2])
-        self.auto_shutdown_enabled = auto_shutdown_match.group(1) == "ON"
-        self.sensor_code = int(auto_shutdown_match.group(2))
+        self.auto_shutdown_enabled = values[2][0] == "ON"
+        self.sensor_code = int(values[2][1])
 
-        self.az_pos = float(parse_get(r"(?:POSN|HOME) +(\d*\.?\d+)", lines[3]))
+        self.az_pos = float(values[3][0])
 
-        self.move_code = int(parse_get(r"(?:RL|RR|--) +(\d+)", lines[4]))
+        self.move_code = int(values[4][0])
 
-        self.estop_active = bool(
-            int(parse_get(r"Emergency Stop Active: +(\d)", lines[5]))
-        )
+        self.estop_active = bool(int(values[5][0]))
 
-        self.scb_link_ok = bool(int(parse_get(r"Top Comm Link OK: +(\d)", lines[6])))
+        self.scb_link_ok = bool(int(values[6][0]))
 
-        self.home_azimuth = float(parse_get(r"Home Azimuth: +(\d*\.?\d+)", lines[7]))
+        self.home_azimuth = float(values[7][0])
 
-        self.high_speed = float(parse_get(r"High Speed.+: +(\d*\.?\d+)", lines[8]))
+        self.high_speed = float(values[8][0])
 
-        self.coast = float(parse_get(r"Coast.+: +(\d*\.?\d+)", lines[9]))
+        self.coast = float(values[9][0])
 
-        self.tolerance = float(parse_get(r"Tolerance.+: +(\d*\.?\d+)", lines[10]))
+        self.tolerance = float(values[10][0])
 
-        self.encoder_counts_per_360 = int(
-            parse_get(r"Encoder Counts per 360: +(\d+)", lines[11])
-        )
+        self.encoder_counts_per_360 = int(values[11][0])
 
-        self.encoder_counts = int(parse_get(r"Encoder Counts: +(\d+)", lines[12]))
+        self.encoder_counts = int(values[12][0])
 
-        self.last_azimuth_goto = float(
-            parse_get(r"Last Azimuth GoTo: +(\d*\.?\d+)", lines[13])
-        )
+        self.last_azimuth_goto = float(values[13][0])
 
-        self.azimuth_move_timeout = float(
-            parse_get(r"Azimuth Move Timeout.+: +(\d*\.?\d+)", lines[14])
-        )
+        self.azimuth_move_timeout = float(values[14][0])
 
-        self.rain_sensor_enabled = bool(
-            int(parse_get(r"Rain-Snow enabled: +(\d)", lines[15]))
-        )
+        self.rain_sensor_enabled = bool(int(values[15][0]))
 
-        self.cloud_sensor_enabled = bool(
-            int(parse_get(r"Cloud Sensor enabled: +(\d)", lines[16]))
-        )
+        self.cloud_sensor_enabled = bool(int(values[16][0]))
 
-        self.watchdog_timer = float(
-            parse_get(r"Watchdog Reset Time: +(\d*\.?\d+)", lines[17])
-        )
+        self.watchdog_timer = float(values[17][0])
 
-        self.dropout_timer = float(parse_get(r"Dropout Timer: +(\d*\.?\d+)", lines[18]))
+        self.dropout_timer = float(values[18][0])
 
-        self.reversal_delay = float(
-            parse_get(r"Reverse Delay: +(\d*\.?\d+)", lines[19])
-        )
+        self.reversal_delay = float(values[19][0])
 
-        self.main_door_encoder_closed = int(
-            parse_get(r"Main Door Encoder Closed: +(\d+)", lines[20])
-        )
+        self.main_door_encoder_closed = int(values[20][0])
 
-        self.main_door_encoder_opened = int(
-            parse_get(r"Main Door Encoder Opened: +(\d+)", lines[21])
-        )
+        self.main_door_encoder_opened = int(values[21][0])
 
-        self.dropout_door_encoder_closed = int(
-            parse_get(r"Dropout Encoder Closed: +(\d+)", lines[22])
-        )
+        self.dropout_door_encoder_closed = int(values[22][0])
 
-        self.dropout_door_encoder_opened = int(
-            parse_get(r"Dropout Encoder Opened: +(\d+)", lines[23])
-        )
+        self.dropout_door_encoder_opened = int(values[23][0])
 
-        self.door_move_timeout = float(
-            parse_get(r"Door Move Timeout.+: +(\d*\.?\d+)", lines[24])
-        )
+        self.door_move_timeout = float(values[24][0])
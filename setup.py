@@ -4,7 +4,7 @@ import setuptools
 import pathlib
 
 install_requires = []
-tests_require = ["pytest", "pytest-cov", "pytest-flake8", "asynctest"]
+tests_require = ["pytest", "pytest-cov", "pytest-flake8"]
 dev_requires = install_requires + tests_require + ["documenteer[pipelines]"]
 scm_version_template = """# Generated by setuptools_scm
 __all__ = ["__version__"]
@@ -19,15 +19,23 @@
 # You should have received a copy of the GNU General Public License
 
 import asyncio
-import glob
 import math
 import os
 import pathlib
 import unittest
 
-import asynctest
 import yaml
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 from lsst.ts import salobj
 from lsst.ts.idl.enums.ATDome import (
     AzimuthCommandedState,
@@ -41,9 +49,55 @@ STD_TIMEOUT = 2  # standard command timeout (sec)
 DOOR_TIMEOUT = 4  # time limit for shutter door commands (sec)
 LONG_TIMEOUT = 20  # timeout for starting SAL components (sec)
 TEST_CONFIG_DIR = pathlib.Path(__file__).parents[1].joinpath("tests", "data", "config")
+CONFIG_PKG_NAME = "ts_config_attcs"
+try:
+    DEFAULT_CONFIG_DIR = (
+        pathlib.Path(os.environ[CONFIG_PKG_NAME.upper() + "_DIR"]) / "ATDome/v1"
+    )
+except KeyError:
+    # test_default_config_dir reports this.
+    DEFAULT_CONFIG_DIR = None
+
+# Shutter events checked by `CscTestCase.check_shutter_events`,
+# as a tuple of (argument name, remote topic attribute name, field name).
+SHUTTER_EVENTS = (
+    ("main_door_cmd_state", "evt_mainDoorCommandedState", "commandedState"),
+    ("dropout_door_cmd_state", "evt_dropoutDoorCommandedState", "commandedState"),
+    ("main_door_state", "evt_mainDoorState", "state"),
+    ("dropout_door_state", "evt_dropoutDoorState", "state"),
+    ("shutter_in_position", "evt_shutterInPosition", "inPosition"),
+)
+
 
+class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Read the test config files once, rather than once per test.
+        all_fields_path = os.path.join(TEST_CONFIG_DIR, "all_fields.yaml")
+        with open(all_fields_path, "rb") as f:
+            cls.all_fields_data = yaml.load(f, Loader=SafeLoader)
+        with os.scandir(TEST_CONFIG_DIR) as entries:
+            cls.bad_config_names = [
+                entry.name
+                for entry in entries
+                if entry.name.startswith("invalid_") and entry.name.endswith(".yaml")
+            ]
+        cls.bad_config_names.append("no_such_file.yaml")
+        # Run this class's tests with the faster uvloop event loop,
+        # if available; tearDownClass restores the previous policy.
+        # Do this last, so tearDownClass is sure to run.
+        cls.saved_event_loop_policy = None
+        if uvloop is not None:
+            cls.saved_event_loop_policy = asyncio.get_event_loop_policy()
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.saved_event_loop_policy is not None:
+            asyncio.set_event_loop_policy(cls.saved_event_loop_policy)
+        super().tearDownClass()
 
-class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
     def basic_make_csc(self, initial_state, config_dir, simulation_mode):
         return ATDome.ATDomeCsc(
             initial_state=initial_state,
@@ -57,12 +111,34 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             initial_state=salobj.State.ENABLED, config_dir=None, simulation_mode=1
         ):
             mock_ctrl = self.csc.mock_ctrl
-            await self.check_initial_shutter_events()
-
-            await self.check_initial_az_events()
-
-            await self.assert_next_sample(
-                topic=self.remote.evt_emergencyStop, active=False
+            # These topics are independent, so read them concurrently.
+            ctrllr_settings, *_ = await asyncio.gather(
+                self.assert_next_sample(
+                    topic=self.remote.evt_settingsAppliedDomeController,
+                    rainSensorEnabled=mock_ctrl.rain_sensor_enabled,
+                    cloudSensorEnabled=mock_ctrl.cloud_sensor_enabled,
+                    autoShutdownEnabled=mock_ctrl.auto_shutdown_enabled,
+                    encoderCountsPer360=mock_ctrl.encoder_counts_per_360,
+                ),
+                self.check_initial_shutter_events(),
+                self.check_initial_az_events(),
+                self.assert_next_sample(
+                    topic=self.remote.evt_emergencyStop, active=False
+                ),
+                self.assert_next_sample(
+                    topic=self.remote.evt_doorEncoderExtremes,
+                    mainClosed=mock_ctrl.main_door_encoder_closed,
+                    mainOpened=mock_ctrl.main_door_encoder_opened,
+                    dropoutClosed=mock_ctrl.dropout_door_encoder_closed,
+                    dropoutOpened=mock_ctrl.dropout_door_encoder_opened,
+                ),
+                self.assert_next_sample(
+                    topic=self.remote.evt_settingsAppliedDomeTcp,
+                    host=self.csc.config.host,
+                    port=self.csc.config.port,
+                    connectionTimeout=self.csc.config.connection_timeout,
+                    readTimeout=self.csc.config.read_timeout,
+                ),
             )
 
             position = await self.assert_next_sample(
@@ -73,13 +149,6 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             )
             self.assertAlmostEqual(position.azimuthPosition, 0)
 
-            ctrllr_settings = await self.assert_next_sample(
-                topic=self.remote.evt_settingsAppliedDomeController,
-                rainSensorEnabled=mock_ctrl.rain_sensor_enabled,
-                cloudSensorEnabled=mock_ctrl.cloud_sensor_enabled,
-                autoShutdownEnabled=mock_ctrl.auto_shutdown_enabled,
-                encoderCountsPer360=mock_ctrl.encoder_counts_per_360,
-            )
             self.assertAlmostEqual(ctrllr_settings.tolerance, mock_ctrl.tolerance)
             self.assertAlmostEqual(ctrllr_settings.homeAzimuth, mock_ctrl.home_az)
             self.assertAlmostEqual(
@@ -102,22 +171,6 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
                 ctrllr_settings.doorMoveTimeout, mock_ctrl.door_move_timeout
             )
 
-            await self.assert_next_sample(
-                topic=self.remote.evt_doorEncoderExtremes,
-                mainClosed=mock_ctrl.main_door_encoder_closed,
-                mainOpened=mock_ctrl.main_door_encoder_opened,
-                dropoutClosed=mock_ctrl.dropout_door_encoder_closed,
-                dropoutOpened=mock_ctrl.dropout_door_encoder_opened,
-            )
-
-            await self.assert_next_sample(
-                topic=self.remote.evt_settingsAppliedDomeTcp,
-                host=self.csc.config.host,
-                port=self.csc.config.port,
-                connectionTimeout=self.csc.config.connection_timeout,
-                readTimeout=self.csc.config.read_timeout,
-            )
-
             # This az_tolerance value after full status has been received
             standard_az_tolerance = self.csc.az_tolerance
             self.assertAlmostEqual(
@@ -142,12 +195,11 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             self.assertEqual(self.csc.summary_state, salobj.State.STANDBY)
             await self.assert_next_summary_state(salobj.State.STANDBY)
 
-            desired_config_pkg_name = "ts_config_attcs"
-            desired_config_env_name = desired_config_pkg_name.upper() + "_DIR"
-            desird_config_pkg_dir = os.environ[desired_config_env_name]
-            desired_config_dir = pathlib.Path(desird_config_pkg_dir) / "ATDome/v1"
-            self.assertEqual(self.csc.get_config_pkg(), desired_config_pkg_name)
-            self.assertEqual(self.csc.config_dir, desired_config_dir)
+            self.assertIsNotNone(
+                DEFAULT_CONFIG_DIR, f"{CONFIG_PKG_NAME.upper()}_DIR is not set"
+            )
+            self.assertEqual(self.csc.get_config_pkg(), CONFIG_PKG_NAME)
+            self.assertEqual(self.csc.config_dir, DEFAULT_CONFIG_DIR)
 
     async def test_configuration(self):
         async with self.make_csc(
@@ -158,26 +210,27 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             self.assertEqual(self.csc.summary_state, salobj.State.STANDBY)
             await self.assert_next_summary_state(salobj.State.STANDBY)
 
-            invalid_files = glob.glob(os.path.join(TEST_CONFIG_DIR, "invalid_*.yaml"))
-            bad_config_names = [os.path.basename(name) for name in invalid_files]
-            bad_config_names.append("no_such_file.yaml")
-            for bad_config_name in bad_config_names:
+            # Each of these start commands fails independently,
+            # so issue them all at once.
+            results = await asyncio.gather(
+                *[
+                    self.remote.cmd_start.set_start(
+                        settingsToApply=bad_config_name, timeout=STD_TIMEOUT
+                    )
+                    for bad_config_name in self.bad_config_names
+                ],
+                return_exceptions=True,
+            )
+            for bad_config_name, result in zip(self.bad_config_names, results):
                 with self.subTest(bad_config_name=bad_config_name):
-                    with salobj.assertRaisesAckError():
-                        await self.remote.cmd_start.set_start(
-                            settingsToApply=bad_config_name, timeout=STD_TIMEOUT
-                        )
+                    self.assertIsInstance(result, salobj.AckError)
 
             await self.remote.cmd_start.set_start(
                 settingsToApply="all_fields", timeout=STD_TIMEOUT
             )
             self.assertEqual(self.csc.summary_state, salobj.State.DISABLED)
             await self.assert_next_summary_state(salobj.State.DISABLED)
-            all_fields_path = os.path.join(TEST_CONFIG_DIR, "all_fields.yaml")
-            with open(all_fields_path, "r") as f:
-                all_fields_raw = f.read()
-            all_fields_data = yaml.safe_load(all_fields_raw)
-            for field, value in all_fields_data.items():
+            for field, value in self.all_fields_data.items():
                 self.assertEqual(getattr(self.csc.config, field), value)
 
     async def test_command_failures(self):
@@ -197,16 +250,110 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             await self.remote.tel_position.next(flush=True, timeout=STD_TIMEOUT)
             await self.remote.tel_position.next(flush=True, timeout=STD_TIMEOUT)
 
+    def test_angle_diff_deg(self):
+        for angle1, angle2, desired_diff in (
+            (359, 1, -2),
+            (1, 359, 2),
+            (180, 0, -180),
+            (0, 180, -180),
+            (10, 5, 5),
+            (-10, 350, 0),
+        ):
+            with self.subTest(angle1=angle1, angle2=angle2):
+                self.assertAlmostEqual(
+                    ATDome.dome_csc.angle_diff_deg(angle1, angle2), desired_diff
+                )
+
+    async def test_compute_in_position_mask(self):
+        """Test the azimuth and shutter door bits of compute_in_position_mask.
+        """
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY, config_dir=None, simulation_mode=1
+        ):
+            # The CSC is not connected in STANDBY state,
+            # so the status loop cannot overwrite the data set here.
+            Axis = ATDome.dome_csc.Axis
+            MoveCode = ATDome.dome_csc.MoveCode
+            dropout_door_info = (
+                self.csc.evt_dropoutDoorCommandedState,
+                "dropoutDoorOpeningPercentage",
+                Axis.DROPOUTDOOR,
+                MoveCode.DROPOUTDOOROPENING,
+                MoveCode.DROPOUTDOORCLOSING,
+            )
+            main_door_info = (
+                self.csc.evt_mainDoorCommandedState,
+                "mainDoorOpeningPercentage",
+                Axis.MAINDOOR,
+                MoveCode.MAINDOOROPENING,
+                MoveCode.MAINDOORCLOSING,
+            )
+            for door_info, other_door_info in (
+                (dropout_door_info, main_door_info),
+                (main_door_info, dropout_door_info),
+            ):
+                cmd_state_topic, pct_field, axis, opening_code, closing_code = door_info
+                # Put the other door out of position, so that only
+                # the door under test can set its in-position bit.
+                other_cmd_state_topic, other_pct_field = other_door_info[0:2]
+                other_cmd_state_topic.set(
+                    commandedState=ShutterDoorCommandedState.UNKNOWN
+                )
+                self.csc.tel_position.set(**{other_pct_field: 50})
+                for cmd_state, pct, move_code, desired_in_position in (
+                    (ShutterDoorCommandedState.OPENED, 100, 0, True),
+                    (ShutterDoorCommandedState.OPENED, 50, 0, False),
+                    (ShutterDoorCommandedState.OPENED, 0, 0, False),
+                    (ShutterDoorCommandedState.OPENED, 100, opening_code, False),
+                    (ShutterDoorCommandedState.OPENED, 100, closing_code, False),
+                    (ShutterDoorCommandedState.CLOSED, 0, 0, True),
+                    (ShutterDoorCommandedState.CLOSED, 50, 0, False),
+                    (ShutterDoorCommandedState.CLOSED, 100, 0, False),
+                    (ShutterDoorCommandedState.CLOSED, 0, closing_code, False),
+                    (ShutterDoorCommandedState.STOP, 50, 0, False),
+                    (ShutterDoorCommandedState.UNKNOWN, 0, 0, False),
+                ):
+                    with self.subTest(
+                        axis=axis, cmd_state=cmd_state, pct=pct, move_code=move_code
+                    ):
+                        cmd_state_topic.set(commandedState=cmd_state)
+                        self.csc.tel_position.set(**{pct_field: pct})
+                        mask = self.csc.compute_in_position_mask(int(move_code))
+                        self.assertEqual(
+                            mask & (Axis.DROPOUTDOOR | Axis.MAINDOOR),
+                            axis if desired_in_position else Axis(0),
+                        )
+
+            # Check azimuth, including wrap around at 0/360.
+            az_tolerance = self.csc.az_tolerance
+            self.csc.evt_azimuthCommandedState.set(
+                commandedState=AzimuthCommandedState.GOTOPOSITION
+            )
+            for cmd_az, az, move_code, desired_in_position in (
+                (0, 0, 0, True),
+                (0, 360 - az_tolerance / 2, 0, True),
+                (359.9, az_tolerance / 2, 0, True),
+                (0, 360 - az_tolerance * 2, 0, False),
+                (359, az_tolerance, 0, False),
+                (0, 0, MoveCode.AZPOSITIVE, False),
+            ):
+                with self.subTest(cmd_az=cmd_az, az=az, move_code=move_code):
+                    self.csc.evt_azimuthCommandedState.set(azimuth=cmd_az)
+                    self.csc.tel_position.set(azimuthPosition=az)
+                    mask = self.csc.compute_in_position_mask(int(move_code))
+                    self.assertEqual(bool(mask & Axis.AZ), desired_in_position)
+
     async def test_home(self):
         async with self.make_csc(
             initial_state=salobj.State.ENABLED, config_dir=None, simulation_mode=1
         ):
+            mock_ctrl = self.csc.mock_ctrl
             await self.check_initial_az_events()
 
             # set home azimuth near current position so homing goes quickly
-            curr_az = self.csc.mock_ctrl.az_actuator.position()
-            home_azimuth = salobj.angle_wrap_nonnegative(curr_az - 2).deg
-            self.csc.mock_ctrl.home_az = home_azimuth
+            curr_az = mock_ctrl.az_actuator.position()
+            home_azimuth = (curr_az - 2) % 360
+            mock_ctrl.home_az = home_azimuth
 
             await self.remote.cmd_homeAzimuth.start(timeout=STD_TIMEOUT)
 
@@ -245,7 +392,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
                 homing=True,
             )
             self.assertAlmostEqual(
-                self.csc.mock_ctrl.az_actuator.speed, self.csc.mock_ctrl.home_az_vel,
+                mock_ctrl.az_actuator.speed, mock_ctrl.home_az_vel,
             )
 
             # wait for the slow CW homing move to finish
@@ -254,9 +401,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
                 state=AzimuthState.NOTINMOTION,
                 homing=False,
             )
-            self.assertAlmostEqual(
-                self.csc.mock_ctrl.az_actuator.speed, self.csc.mock_ctrl.az_vel
-            )
+            self.assertAlmostEqual(mock_ctrl.az_actuator.speed, mock_ctrl.az_vel)
             position = await self.assert_next_sample(
                 topic=self.remote.tel_position, flush=True
             )
@@ -297,12 +442,20 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             position = self.remote.tel_position.get()
             self.assertAlmostEqual(position.azimuthPosition, desired_azimuth)
 
-            # try several invalid values for azimuth
-            for bad_az in (-0.001, 360.001):
-                with salobj.assertRaisesAckError():
-                    await self.remote.cmd_moveAzimuth.set_start(
+            # try several invalid values for azimuth, all at once
+            bad_azimuths = (-0.001, 360.001)
+            results = await asyncio.gather(
+                *[
+                    self.remote.cmd_moveAzimuth.set_start(
                         azimuth=bad_az, timeout=STD_TIMEOUT
                     )
+                    for bad_az in bad_azimuths
+                ],
+                return_exceptions=True,
+            )
+            for bad_az, result in zip(bad_azimuths, results):
+                with self.subTest(bad_az=bad_az):
+                    self.assertIsInstance(result, salobj.AckError)
 
     async def test_move_shutter(self):
         """Test openShutter and closeShutter commands.
@@ -366,17 +519,10 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
 
             # check that we cannot open or close the dropout door
             # because the main door is not fully open
-            with salobj.assertRaisesAckError():
-                await self.remote.cmd_moveShutterDropoutDoor.set_start(
-                    open=True, timeout=STD_TIMEOUT
-                )
-            with salobj.assertRaisesAckError():
-                await self.remote.cmd_moveShutterDropoutDoor.set_start(
-                    open=False, timeout=STD_TIMEOUT
-                )
+            await self.check_dropout_door_cannot_move()
 
             # start opening the main door
-            main_open_task = asyncio.ensure_future(
+            main_open_task = asyncio.create_task(
                 self.remote.cmd_moveShutterMainDoor.set_start(
                     open=True, timeout=DOOR_TIMEOUT
                 )
@@ -392,14 +538,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
 
             # check that we cannot open or close the dropout door
             # because the main door is not fully open
-            with salobj.assertRaisesAckError():
-                await self.remote.cmd_moveShutterDropoutDoor.set_start(
-                    open=True, timeout=STD_TIMEOUT
-                )
-            with salobj.assertRaisesAckError():
-                await self.remote.cmd_moveShutterDropoutDoor.set_start(
-                    open=False, timeout=STD_TIMEOUT
-                )
+            await self.check_dropout_door_cannot_move()
 
             # wait for the move to end
             await main_open_task
@@ -420,7 +559,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             )
 
             # start opening the dropout door
-            dropout_open_task = asyncio.ensure_future(
+            dropout_open_task = asyncio.create_task(
                 self.remote.cmd_moveShutterDropoutDoor.set_start(
                     open=True, timeout=DOOR_TIMEOUT
                 )
@@ -460,7 +599,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             )
 
             # start closing the main door
-            main_close_task = asyncio.ensure_future(
+            main_close_task = asyncio.create_task(
                 self.remote.cmd_moveShutterMainDoor.set_start(
                     open=False, timeout=DOOR_TIMEOUT
                 )
@@ -476,14 +615,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
 
             # check that we cannot open or close the dropout door
             # because the main door is not fully open
-            with salobj.assertRaisesAckError():
-                await self.remote.cmd_moveShutterDropoutDoor.set_start(
-                    open=True, timeout=STD_TIMEOUT
-                )
-            with salobj.assertRaisesAckError():
-                await self.remote.cmd_moveShutterDropoutDoor.set_start(
-                    open=False, timeout=STD_TIMEOUT
-                )
+            await self.check_dropout_door_cannot_move()
 
             # wait for the main door to finish closing
             await main_close_task
@@ -523,7 +655,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             )
 
             # start closing the dropout door
-            dropout_close_task = asyncio.ensure_future(
+            dropout_close_task = asyncio.create_task(
                 self.remote.cmd_moveShutterDropoutDoor.set_start(
                     open=False, timeout=DOOR_TIMEOUT
                 )
@@ -563,7 +695,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             )
 
             # start closing the main door
-            main_close_task = asyncio.ensure_future(
+            main_close_task = asyncio.create_task(
                 self.remote.cmd_moveShutterMainDoor.set_start(
                     open=False, timeout=DOOR_TIMEOUT
                 )
@@ -579,14 +711,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
 
             # check that we cannot open or close the dropout door
             # because the main door is not fully open
-            with salobj.assertRaisesAckError():
-                await self.remote.cmd_moveShutterDropoutDoor.set_start(
-                    open=True, timeout=STD_TIMEOUT
-                )
-            with salobj.assertRaisesAckError():
-                await self.remote.cmd_moveShutterDropoutDoor.set_start(
-                    open=False, timeout=STD_TIMEOUT
-                )
+            await self.check_dropout_door_cannot_move()
 
             # wait for the main door to finish closing
             await main_close_task
@@ -605,7 +730,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             await self.check_initial_shutter_events()
 
             # start opening the both doors
-            open_task = asyncio.ensure_future(
+            open_task = asyncio.create_task(
                 self.remote.cmd_openShutter.start(timeout=DOOR_TIMEOUT)
             )
 
@@ -619,13 +744,14 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             )
 
             # start closing the shutter
-            close_task = asyncio.ensure_future(
+            close_task = asyncio.create_task(
                 self.remote.cmd_closeShutter.start(timeout=DOOR_TIMEOUT)
             )
 
             # check that this supersedes opening the shutter
-            with salobj.assertRaisesAckError(ack=salobj.SalRetCode.CMD_ABORTED):
-                await open_task
+            await self.check_superseded(
+                superseded_task=open_task, superseding_task=close_task
+            )
 
             # check status of closing both doors
             await self.check_shutter_events(
@@ -672,7 +798,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             )
 
             # start closing the dropout door
-            dropout_close_task = asyncio.ensure_future(
+            dropout_close_task = asyncio.create_task(
                 self.remote.cmd_moveShutterDropoutDoor.set_start(
                     open=False, timeout=DOOR_TIMEOUT
                 )
@@ -687,13 +813,14 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             )
 
             # start opening the shutter
-            open_task = asyncio.ensure_future(
+            open_task = asyncio.create_task(
                 self.remote.cmd_openShutter.start(timeout=DOOR_TIMEOUT)
             )
 
             # check that opening the shutter supersedes closing dropout door
-            with salobj.assertRaisesAckError(ack=salobj.SalRetCode.CMD_ABORTED):
-                await dropout_close_task
+            await self.check_superseded(
+                superseded_task=dropout_close_task, superseding_task=open_task
+            )
 
             # check status of closing both doors;
             # main door was already open but its cmd state is output
@@ -720,7 +847,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             await self.check_initial_shutter_events()
 
             # start opening the main door
-            main_open_task = asyncio.ensure_future(
+            main_open_task = asyncio.create_task(
                 self.remote.cmd_moveShutterMainDoor.set_start(
                     open=True, timeout=DOOR_TIMEOUT
                 )
@@ -736,12 +863,13 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
 
             # start closing the shutter;
             # this supersedes opening the main door
-            close_task = asyncio.ensure_future(
+            close_task = asyncio.create_task(
                 self.remote.cmd_closeShutter.start(timeout=DOOR_TIMEOUT)
             )
 
-            with salobj.assertRaisesAckError(ack=salobj.SalRetCode.CMD_ABORTED):
-                await main_open_task
+            await self.check_superseded(
+                superseded_task=main_open_task, superseding_task=close_task
+            )
 
             # check status of closing both doors;
             # dropout door was already closed but its cmd state is output
@@ -785,7 +913,7 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             )
 
             # start closing both doors
-            close_task = asyncio.ensure_future(
+            close_task = asyncio.create_task(
                 self.remote.cmd_closeShutter.start(timeout=DOOR_TIMEOUT)
             )
 
@@ -799,13 +927,14 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             )
 
             # start opening both doors (again)
-            open_task = asyncio.ensure_future(
+            open_task = asyncio.create_task(
                 self.remote.cmd_openShutter.start(timeout=DOOR_TIMEOUT)
             )
 
             # check that the open command superseded the close command
-            with salobj.assertRaisesAckError(ack=salobj.SalRetCode.CMD_ABORTED):
-                await close_task
+            await self.check_superseded(
+                superseded_task=close_task, superseding_task=open_task
+            )
 
             # check opening status;
             # shutter_in_position is still False, so not output
@@ -833,52 +962,14 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
         async with self.make_csc(
             initial_state=salobj.State.ENABLED, config_dir=None, simulation_mode=1
         ):
-            await self.check_initial_az_events()
-            await self.check_initial_shutter_events()
-
-            # move azimuth and start opening the shutter
-            await self.remote.cmd_moveAzimuth.set_start(
-                azimuth=354, timeout=STD_TIMEOUT
-            )
-            shutter_open_task = asyncio.ensure_future(
-                self.remote.cmd_openShutter.start(timeout=STD_TIMEOUT)
-            )
-
-            # wait for the moves to start
-            await self.assert_next_sample(
-                topic=self.remote.evt_azimuthState,
-                state=AzimuthState.MOVINGCCW,
-                homing=False,
-            )
-            await self.assert_next_sample(
-                self.remote.evt_azimuthInPosition, inPosition=False
-            )
-
-            # check that the shutter was told to open;
-            # shutter_in_position remains false so is not output
-            await self.check_shutter_events(
-                dropout_door_cmd_state=ShutterDoorCommandedState.OPENED,
-                main_door_cmd_state=ShutterDoorCommandedState.OPENED,
-                dropout_door_state=ShutterDoorState.OPENING,
-                main_door_state=ShutterDoorState.OPENING,
-            )
+            shutter_open_task = await self.start_az_and_shutter_moves()
 
             # disable the CSC
             # this should not produce new "inPosition" events, because
             # motion is stopped while the axes are still not in position
             await self.remote.cmd_disable.start(timeout=STD_TIMEOUT)
 
-            # make sure the shutter command was cancelled
-            with salobj.assertRaisesAckError(ack=salobj.SalRetCode.CMD_ABORTED):
-                await shutter_open_task
-
-            await self.assert_next_sample(
-                topic=self.remote.evt_azimuthState,
-                state=AzimuthState.NOTINMOTION,
-                homing=False,
-            )
-            with self.assertRaises(asyncio.TimeoutError):
-                await self.remote.evt_azimuthInPosition.next(flush=False, timeout=0.1)
+            await self.check_moves_halted(shutter_open_task)
 
             # check that the shutter was told to close
             await self.check_shutter_events(
@@ -899,52 +990,14 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
         async with self.make_csc(
             initial_state=salobj.State.ENABLED, config_dir=None, simulation_mode=1
         ):
-            await self.check_initial_az_events()
-            await self.check_initial_shutter_events()
-
-            # move azimuth and start opening the shutter
-            await self.remote.cmd_moveAzimuth.set_start(
-                azimuth=354, timeout=STD_TIMEOUT
-            )
-            shutter_open_task = asyncio.ensure_future(
-                self.remote.cmd_openShutter.start(timeout=STD_TIMEOUT)
-            )
-
-            # wait for the moves to start
-            await self.assert_next_sample(
-                topic=self.remote.evt_azimuthState,
-                state=AzimuthState.MOVINGCCW,
-                homing=False,
-            )
-            await self.assert_next_sample(
-                self.remote.evt_azimuthInPosition, inPosition=False
-            )
-
-            # check that the shutter was told to open;
-            # shutter_in_position remains false so is not output
-            await self.check_shutter_events(
-                dropout_door_cmd_state=ShutterDoorCommandedState.OPENED,
-                main_door_cmd_state=ShutterDoorCommandedState.OPENED,
-                dropout_door_state=ShutterDoorState.OPENING,
-                main_door_state=ShutterDoorState.OPENING,
-            )
+            shutter_open_task = await self.start_az_and_shutter_moves()
 
             # stop all motion
             # this should not produce new "inPosition" events, because
             # motion is stopped while the axes are still not in position
             await self.remote.cmd_stopMotion.start(timeout=STD_TIMEOUT)
 
-            # make sure the shutter command was cancelled
-            with salobj.assertRaisesAckError(ack=salobj.SalRetCode.CMD_ABORTED):
-                await shutter_open_task
-
-            await self.assert_next_sample(
-                topic=self.remote.evt_azimuthState,
-                state=AzimuthState.NOTINMOTION,
-                homing=False,
-            )
-            with self.assertRaises(asyncio.TimeoutError):
-                await self.remote.evt_azimuthInPosition.next(flush=False, timeout=0.1)
+            await self.check_moves_halted(shutter_open_task)
 
             # check that the shutter was told to stop;
             # shutter_in_position remains false so is not output
@@ -954,8 +1007,82 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
                 dropout_door_state=ShutterDoorState.PARTIALLYOPENED,
                 main_door_state=ShutterDoorState.PARTIALLYOPENED,
             )
-            with self.assertRaises(asyncio.TimeoutError):
-                await self.remote.evt_shutterInPosition.next(flush=False, timeout=0.1)
+            await self.check_no_new_sample(self.remote.evt_shutterInPosition)
+
+    async def test_reconnect(self):
+        """Test that the door, in-position and emergency stop events
+        are correct after disconnecting and reconnecting.
+        """
+        async with self.make_csc(
+            initial_state=salobj.State.ENABLED, config_dir=None, simulation_mode=1
+        ):
+            await asyncio.gather(
+                self.check_initial_shutter_events(),
+                self.assert_next_sample(
+                    topic=self.remote.evt_emergencyStop, active=False
+                ),
+            )
+            self.csc.mock_ctrl.estop_active = True
+            await self.assert_next_sample(
+                topic=self.remote.evt_emergencyStop, active=True
+            )
+
+            # Disabling commands the (already closed) shutter to close.
+            await self.remote.cmd_disable.start(timeout=STD_TIMEOUT)
+            await self.assert_next_sample(
+                topic=self.remote.evt_shutterInPosition, inPosition=True
+            )
+
+            # Going to standby disconnects and stops the mock controller.
+            # Going back to disabled connects to a new mock controller,
+            # which does not have the emergency stop active.
+            await self.remote.cmd_standby.start(timeout=STD_TIMEOUT)
+            await self.remote.cmd_start.start(timeout=STD_TIMEOUT)
+            self.assertTrue(self.csc.connected)
+            await self.assert_next_sample(
+                topic=self.remote.evt_emergencyStop, active=False
+            )
+            self.assertEqual(
+                self.remote.evt_dropoutDoorState.get().state, ShutterDoorState.CLOSED
+            )
+            self.assertEqual(
+                self.remote.evt_mainDoorState.get().state, ShutterDoorState.CLOSED
+            )
+            self.assertFalse(self.remote.evt_azimuthInPosition.get().inPosition)
+            self.assertTrue(self.remote.evt_shutterInPosition.get().inPosition)
+            self.assertFalse(self.remote.evt_allAxesInPosition.get().inPosition)
+
+    async def test_standby_while_connecting(self):
+        """Test going to standby while the CSC is still connecting
+        to the controller.
+        """
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY, config_dir=None, simulation_mode=1
+        ):
+            # Make connecting slow, so there is time to go to standby.
+            connecting_event = asyncio.Event()
+            start_mock_ctrl = self.csc.start_mock_ctrl
+
+            async def slow_start_mock_ctrl():
+                connecting_event.set()
+                await asyncio.sleep(STD_TIMEOUT)
+                await start_mock_ctrl()
+
+            self.csc.start_mock_ctrl = slow_start_mock_ctrl
+
+            start_task = asyncio.create_task(
+                self.remote.cmd_start.start(timeout=LONG_TIMEOUT)
+            )
+            await asyncio.wait_for(connecting_event.wait(), timeout=STD_TIMEOUT)
+            self.assertEqual(self.csc.summary_state, salobj.State.DISABLED)
+            await self.remote.cmd_standby.start(timeout=STD_TIMEOUT)
+
+            # The start command succeeds, even though connecting was cancelled.
+            await asyncio.wait_for(start_task, timeout=STD_TIMEOUT)
+            self.assertEqual(self.csc.summary_state, salobj.State.STANDBY)
+            self.assertTrue(self.csc.connect_task.cancelled())
+            self.assertFalse(self.csc.connected)
+            self.assertIsNone(self.csc.mock_ctrl)
 
     async def test_bin_script(self):
         await self.check_bin_script(name="ATDome", index=None, exe_name="run_atdome.py")
@@ -976,20 +1103,137 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
                 )
             )
 
-    async def check_initial_az_events(self):
-        """Read and check initial azimuthCommandedState and azimuthState.
+    async def check_dropout_door_cannot_move(self):
+        """Check that commands to open and close the dropout door both fail.
+
+        The two commands are independent, so they are sent concurrently.
         """
-        az_cmd_state = await self.assert_next_sample(
-            topic=self.remote.evt_azimuthCommandedState,
-            commandedState=AzimuthCommandedState.UNKNOWN,
+        results = await asyncio.gather(
+            self.remote.cmd_moveShutterDropoutDoor.set_start(
+                open=True, timeout=STD_TIMEOUT
+            ),
+            self.remote.cmd_moveShutterDropoutDoor.set_start(
+                open=False, timeout=STD_TIMEOUT
+            ),
+            return_exceptions=True,
         )
-        self.assertTrue(math.isnan(az_cmd_state.azimuth))
+        for result in results:
+            self.assertIsInstance(result, salobj.AckError)
+
+    async def start_az_and_shutter_moves(self):
+        """Move azimuth, start opening the shutter, and check that
+        both moves have started.
+
+        Read and check the initial azimuth and shutter events first.
+
+        Returns
+        -------
+        shutter_open_task : `asyncio.Task`
+            The task running the ``openShutter`` command.
+        """
+        await self.check_initial_az_events()
+        await self.check_initial_shutter_events()
+
+        # move azimuth and start opening the shutter
+        await self.remote.cmd_moveAzimuth.set_start(azimuth=354, timeout=STD_TIMEOUT)
+        shutter_open_task = asyncio.create_task(
+            self.remote.cmd_openShutter.start(timeout=STD_TIMEOUT)
+        )
+
+        # wait for the moves to start
+        await self.assert_next_sample(
+            topic=self.remote.evt_azimuthState,
+            state=AzimuthState.MOVINGCCW,
+            homing=False,
+        )
+        await self.assert_next_sample(
+            self.remote.evt_azimuthInPosition, inPosition=False
+        )
+
+        # check that the shutter was told to open;
+        # shutter_in_position remains false so is not output
+        await self.check_shutter_events(
+            dropout_door_cmd_state=ShutterDoorCommandedState.OPENED,
+            main_door_cmd_state=ShutterDoorCommandedState.OPENED,
+            dropout_door_state=ShutterDoorState.OPENING,
+            main_door_state=ShutterDoorState.OPENING,
+        )
+        return shutter_open_task
+
+    async def check_moves_halted(self, shutter_open_task):
+        """Check that the moves started by `start_az_and_shutter_moves`
+        were halted, without the azimuth reaching its target.
+
+        Parameters
+        ----------
+        shutter_open_task : `asyncio.Task`
+            The task returned by `start_az_and_shutter_moves`.
+        """
+        # make sure the shutter command was cancelled
+        with salobj.assertRaisesAckError(ack=salobj.SalRetCode.CMD_ABORTED):
+            await shutter_open_task
 
         await self.assert_next_sample(
             topic=self.remote.evt_azimuthState,
             state=AzimuthState.NOTINMOTION,
             homing=False,
         )
+        await self.check_no_new_sample(self.remote.evt_azimuthInPosition)
+
+    async def check_superseded(self, superseded_task, superseding_task):
+        """Check that a command was superseded by a later command.
+
+        Wait for whichever command finishes first, so that if the later
+        command fails, that failure is reported right away, rather than
+        after the earlier command times out.
+
+        Parameters
+        ----------
+        superseded_task : `asyncio.Task`
+            Task running the earlier command, which should be aborted.
+        superseding_task : `asyncio.Task`
+            Task running the later command.
+        """
+        done, _ = await asyncio.wait(
+            {superseded_task, superseding_task},
+            timeout=DOOR_TIMEOUT,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if superseded_task not in done:
+            if superseding_task in done:
+                # Raise the exception, if any, from the later command.
+                superseding_task.result()
+            self.fail("The earlier command was not superseded")
+        with salobj.assertRaisesAckError(ack=salobj.SalRetCode.CMD_ABORTED):
+            superseded_task.result()
+
+    async def check_no_new_sample(self, topic):
+        """Check that no new sample is read from a topic
+        within a short time.
+
+        Parameters
+        ----------
+        topic : `lsst.ts.salobj.topics.ReadTopic`
+            Topic to read.
+        """
+        with self.assertRaises(asyncio.TimeoutError):
+            await topic.next(flush=False, timeout=0.1)
+
+    async def check_initial_az_events(self):
+        """Read and check initial azimuthCommandedState and azimuthState.
+        """
+        az_cmd_state, _ = await asyncio.gather(
+            self.assert_next_sample(
+                topic=self.remote.evt_azimuthCommandedState,
+                commandedState=AzimuthCommandedState.UNKNOWN,
+            ),
+            self.assert_next_sample(
+                topic=self.remote.evt_azimuthState,
+                state=AzimuthState.NOTINMOTION,
+                homing=False,
+            ),
+        )
+        self.assertTrue(math.isnan(az_cmd_state.azimuth))
 
     async def check_initial_shutter_events(self):
         """Read and check the initial state of the shutter events.
@@ -1037,38 +1281,36 @@ class CscTestCase(salobj.BaseCscTestCase, asynctest.TestCase):
             Desired state of the ``shutterInPosition`` event.
             If None then this event is not read.
         """
-        if main_door_cmd_state is not None:
-            data = await self.remote.evt_mainDoorCommandedState.next(
-                flush=False, timeout=STD_TIMEOUT
-            )
-            self.assertEqual(data.commandedState, main_door_cmd_state)
-
-        if dropout_door_cmd_state is not None:
-            data = await self.remote.evt_dropoutDoorCommandedState.next(
-                flush=False, timeout=STD_TIMEOUT
-            )
-            self.assertEqual(data.commandedState, dropout_door_cmd_state)
-
-        if main_door_state is not None:
-            data = await self.remote.evt_mainDoorState.next(
-                flush=False, timeout=STD_TIMEOUT
-            )
-            self.assertEqual(data.state, main_door_state)
-
-        if dropout_door_state is not None:
-            data = await self.remote.evt_dropoutDoorState.next(
-                flush=False, timeout=STD_TIMEOUT
-            )
-            self.assertEqual(data.state, dropout_door_state)
-
-        if shutter_in_position is not None:
-            data = await self.remote.evt_shutterInPosition.next(
-                flush=False, timeout=STD_TIMEOUT
-            )
-            if shutter_in_position:
-                self.assertTrue(data.inPosition)
-            else:
-                self.assertFalse(data.inPosition)
+        expected_values = dict(
+            main_door_cmd_state=main_door_cmd_state,
+            dropout_door_cmd_state=dropout_door_cmd_state,
+            main_door_state=main_door_state,
+            dropout_door_state=dropout_door_state,
+            shutter_in_position=shutter_in_position,
+        )
+        # List of (topic, field name, expected value) to check.
+        checks = [
+            (getattr(self.remote, topic_name), field, expected_values[arg_name])
+            for arg_name, topic_name, field in SHUTTER_EVENTS
+            if expected_values[arg_name] is not None
+        ]
+
+        # Use samples that are already queued, without waiting.
+        # The events are independent, so read the rest concurrently,
+        # with one time limit for the group.
+        samples = [topic.get_oldest() for topic, _, _ in checks]
+        missing_indices = [i for i, data in enumerate(samples) if data is None]
+        if missing_indices:
+            read_samples = await asyncio.wait_for(
+                asyncio.gather(
+                    *[checks[i][0].next(flush=False) for i in missing_indices]
+                ),
+                timeout=STD_TIMEOUT,
+            )
+            for i, data in zip(missing_indices, read_samples):
+                samples[i] = data
+        for (topic, field, expected_value), data in zip(checks, samples):
+            self.assertEqual(getattr(data, field), expected_value)
 
 
 if __name__ == "__main__":
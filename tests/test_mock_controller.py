@@ -21,17 +21,15 @@
 import asyncio
 import unittest
 
-import asynctest
-
 from lsst.ts import salobj
 from lsst.ts import ATDome
 
 
-class MockTestCase(asynctest.TestCase):
+class MockTestCase(unittest.IsolatedAsyncioTestCase):
     """Test MockDomeController, Status and LongStatus
     """
 
-    async def setUp(self):
+    async def asyncSetUp(self):
         self.ctrl = None
         self.writer = None
 
@@ -45,7 +43,7 @@ class MockTestCase(asynctest.TestCase):
         read_str = read_bytes.decode().strip()
         self.assertEqual(read_str, "ACE Main Box\n>")
 
-    async def tearDown(self):
+    async def asyncTearDown(self):
         if self.ctrl:
             await asyncio.wait_for(self.ctrl.stop(), 5)
         if self.writer: